@@ -16,13 +16,36 @@ injecting a different ``LLMClient`` implementation.
 from __future__ import annotations
 
 import abc
+import asyncio
+import functools
+import hashlib
 import importlib.util
+import inspect
 import json
 import os
+import queue
+import re
+import shelve
+import sqlite3
+import threading
 import time
+import uuid
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
 
 # =========================
@@ -30,32 +53,90 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol
 # =========================
 
 
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last now_iso call;
+# swapped as one tuple so concurrent callers always see a matching pair.
+_iso_second_cache: Tuple[int, str] = (-1, "")
+
+
 def now_iso() -> str:
     """Return the current UTC timestamp in ISO-8601 format."""
 
-    return datetime.utcnow().isoformat() + "Z"
+    global _iso_second_cache
+
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _iso_second_cache
+    if cached_second != seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _iso_second_cache = (seconds, prefix)
+    return f"{prefix}.{micros:06d}Z"
+
+
+# orjson emits UTF-8 bytes directly; values it rejects (e.g. integers wider
+# than 64 bits) fall back to the stdlib encoder.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
 
 
 def json_dump(obj: Any) -> str:
     """Pretty-print JSON with UTF-8 support."""
 
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
     return json.dumps(obj, ensure_ascii=False, indent=2)
 
 
+def json_compact(obj: Any) -> str:
+    """Serialize JSON without whitespace, for payloads only a model reads."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# orjson decodes integers outside the 64-bit range as floats; any run of 19+
+# digits might be one, so such input goes to the stdlib decoder instead.
+_WIDE_INT_RE = re.compile(r"\d{19,}")
+_WIDE_INT_BYTES_RE = re.compile(rb"\d{19,}")
+
+
+def json_loads(data: Any) -> Any:
+    """Decode JSON from ``str`` or ``bytes``, keeping wide integers exact."""
+
+    if orjson is not None:
+        pattern = _WIDE_INT_RE if isinstance(data, str) else _WIDE_INT_BYTES_RE
+        if not pattern.search(data):
+            return orjson.loads(data)
+    return json.loads(data)
+
+
+_FENCE_RE = re.compile(r"^[ \t]*```[^\n]*(?:\n|\Z)", re.MULTILINE)
+_SMALL_FENCED_TEXT = 512
+
+
 def strip_json_fences(text: str) -> str:
     """Remove markdown-style code fences to improve JSON parsing resilience."""
 
-    lines: Iterable[str] = (
-        line for line in text.splitlines() if not line.strip().startswith("```")
-    )
-    return "\n".join(lines)
+    if "```" not in text:
+        return text
+    if len(text) < _SMALL_FENCED_TEXT and text.startswith("```") and text.count("```") == 2:
+        # Common short reply: one opening and one closing fence line. Peel
+        # them off with plain string ops; anything else takes the regex path.
+        _, _, rest = text.partition("\n")
+        body, sep, tail = rest.rpartition("\n")
+        if tail.lstrip(" \t").startswith("```"):
+            return body + sep
+    return _FENCE_RE.sub("", text)
 
 
 def parse_json(text: str) -> Any:
     """Parse JSON from raw model output, handling lightly fenced payloads."""
 
-    cleaned = strip_json_fences(text.strip())
-    return json.loads(cleaned)
+    return json_loads(strip_json_fences(text.strip()))
 
 
 # =========================
@@ -86,6 +167,7 @@ class Step:
     started_at: Optional[str] = None
     finished_at: Optional[str] = None
     duration_seconds: Optional[float] = None
+    summary: Optional[str] = None
 
     def mark_started(self) -> None:
         self.started_at = now_iso()
@@ -113,6 +195,34 @@ class Task:
 # =========================
 
 
+_tool_loop: Optional[asyncio.AbstractEventLoop] = None
+_tool_loop_lock = threading.Lock()
+
+
+def _get_tool_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop shared by all coroutine tools.
+
+    Running every async tool on one long-lived loop lets them share pooled
+    connections, which are bound to the loop that opened them.
+    """
+
+    global _tool_loop
+
+    with _tool_loop_lock:
+        if _tool_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tool-event-loop", daemon=True).start()
+            _tool_loop = loop
+        return _tool_loop
+
+
+def _run_on_tool_loop(awaitable: Any) -> Any:
+    async def wait() -> Any:
+        return await awaitable
+
+    return asyncio.run_coroutine_threadsafe(wait(), _get_tool_loop()).result()
+
+
 class ToolRegistry:
     def __init__(self) -> None:
         self.tools: Dict[str, Callable[..., Any]] = {}
@@ -123,15 +233,29 @@ class ToolRegistry:
         self.tools[name] = fn
 
     def call(self, name: str, **kwargs) -> Any:
-        if name not in self.tools:
+        fn = self.tools.get(name)
+        if fn is None:
             raise ValueError(f"Unknown tool: {name}")
-        return self.tools[name](**kwargs)
+        result = fn(**kwargs)
+        if inspect.isawaitable(result):
+            return _run_on_tool_loop(result)
+        return result
+
+    def get_tool(self, name: str) -> Callable[..., Any]:
+        """Return the callable for ``name`` so hot callers can skip the lookup."""
+
+        fn = self.tools.get(name)
+        if fn is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return fn
 
     def available(self) -> List[str]:
         return sorted(self.tools.keys())
 
 
-def web_search_tool(query: str, max_results: int = 3) -> List[Dict[str, Any]]:
+async def web_search_tool(query: str, max_results: int = 3) -> List[Dict[str, Any]]:
+    # Stub. A real search backend should keep one pooled async HTTP client
+    # on the tool loop so concurrent steps share connections.
     print(f"[web_search_tool] Searching for: {query}")
     return [{"title": f"Fake result for {query}", "url": "https://example.com"} for _ in range(max_results)]
 
@@ -184,23 +308,50 @@ class DummyLLMClient:
         return f"[DUMMY LLM RESPONSE]\n{user[:400]}"
 
 
+@functools.lru_cache(maxsize=1)
+def _get_openai_client(api_key: str, base_url: Optional[str] = None) -> Any:
+    """Return a process-wide OpenAI client backed by a keep-alive HTTP pool.
+
+    Sharing one client lets every agent reuse the same TCP+TLS connections
+    instead of paying a handshake per client instance.
+    """
+
+    import httpx  # type: ignore
+    from openai import OpenAI  # type: ignore
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(60.0),
+    )
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+
 class OpenAIChatClient:
     """Simple OpenAI Chat Completions client.
 
     Requires ``openai`` to be installed and ``OPENAI_API_KEY`` to be set.
+    Instances with the same credentials share one underlying HTTP pool.
     """
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
         if importlib.util.find_spec("openai") is None:
             raise RuntimeError("The 'openai' package is required for OpenAIChatClient")
 
-        from openai import OpenAI  # type: ignore
-
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise RuntimeError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+
+    @functools.cached_property
+    def client(self) -> Any:
+        # Built on first use so processes that never chat skip importing openai.
+        return _get_openai_client(self.api_key, self.base_url)
 
     def chat(self, system: str, user: str) -> str:
         response = self.client.chat.completions.create(
@@ -214,23 +365,616 @@ class OpenAIChatClient:
         return message or ""
 
 
+class BatchingLLMClient:
+    """Coalesce chat calls into OpenAI Batch API submissions.
+
+    Non-priority calls are queued and a background thread flushes them every
+    ``flush_interval`` seconds (or once ``max_batch`` are waiting) as a single
+    JSONL upload to ``/v1/batches``. A second thread polls every in-flight
+    batch each ``poll_interval`` seconds, so new batches are submitted while
+    earlier ones are still running. Batches are billed at a discount but may
+    take minutes to complete, so pass ``priority=True`` for latency-sensitive
+    calls; those go straight to the real-time endpoint.
+
+    ``realtime`` defaults to an ``OpenAIChatClient`` and ``client`` (the SDK
+    object providing ``files`` and ``batches``) to that client's SDK handle;
+    pass either to reuse an existing client. ``close()`` stops both threads
+    and fails every call that has not been answered yet.
+    """
+
+    _TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        flush_interval: float = 0.5,
+        max_batch: int = 1000,
+        poll_interval: float = 10.0,
+        realtime: Optional[LLMClient] = None,
+        client: Optional[Any] = None,
+    ) -> None:
+        self.realtime = realtime if realtime is not None else OpenAIChatClient(model=model, api_key=api_key)
+        self._client = client
+        self.model = model
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.poll_interval = poll_interval
+        self._closed = False
+        self._queue: "queue.Queue[Optional[Tuple[str, str, str, Future]]]" = queue.Queue()
+        # batch id -> futures still waiting on that batch, keyed by custom_id
+        self._in_flight: Dict[str, Dict[str, Future]] = {}
+        self._in_flight_cond = threading.Condition()
+        self._flusher = threading.Thread(target=self._flush_loop, name="llm-batch-flusher", daemon=True)
+        self._poller = threading.Thread(target=self._poll_loop, name="llm-batch-poller", daemon=True)
+        self._flusher.start()
+        self._poller.start()
+
+    @property
+    def batch_client(self) -> Any:
+        return self._client if self._client is not None else self.realtime.client
+
+    def submit(self, system: str, user: str) -> "Future[str]":
+        if self._closed:
+            raise RuntimeError("BatchingLLMClient is closed")
+        future: "Future[str]" = Future()
+        self._queue.put((uuid.uuid4().hex, system, user, future))
+        return future
+
+    def chat(self, system: str, user: str, *, priority: bool = False) -> str:
+        if priority:
+            return self.realtime.chat(system=system, user=user)
+        return self.submit(system, user).result()
+
+    def close(self) -> None:
+        """Stop the background threads and fail all unanswered calls."""
+
+        with self._in_flight_cond:
+            if self._closed:
+                return
+            self._closed = True
+            in_flight = list(self._in_flight.values())
+            self._in_flight.clear()
+            self._in_flight_cond.notify_all()
+
+        closed = RuntimeError("BatchingLLMClient was closed before the batch finished")
+        for futures in in_flight:
+            for future in futures.values():
+                _settle(future, exc=closed)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                _settle(item[3], exc=closed)
+        # Queued after draining so the flusher is sure to see it and exit.
+        self._queue.put(None)
+
+    def _flush_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(pending) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                pending.append(item)
+
+            futures = {custom_id: future for custom_id, _, _, future in pending}
+            try:
+                batch_id = self._create_batch(pending)
+            except Exception as exc:  # pragma: no cover - network failure path
+                for future in futures.values():
+                    _settle(future, exc=exc)
+                continue
+            with self._in_flight_cond:
+                if self._closed:
+                    closed = RuntimeError("BatchingLLMClient was closed before the batch finished")
+                    for future in futures.values():
+                        _settle(future, exc=closed)
+                    continue
+                self._in_flight[batch_id] = futures
+                self._in_flight_cond.notify_all()
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._in_flight_cond:
+                while not self._in_flight and not self._closed:
+                    self._in_flight_cond.wait()
+                if self._closed:
+                    return
+                in_flight = list(self._in_flight.items())
+
+            for batch_id, futures in in_flight:
+                try:
+                    finished = self._collect_batch(batch_id, futures)
+                except Exception as exc:  # pragma: no cover - network failure path
+                    finished = True
+                    for future in futures.values():
+                        _settle(future, exc=exc)
+                if finished:
+                    with self._in_flight_cond:
+                        self._in_flight.pop(batch_id, None)
+
+            with self._in_flight_cond:
+                if not self._closed:
+                    self._in_flight_cond.wait(self.poll_interval)
+
+    def _create_batch(self, pending: List[Tuple[str, str, str, Future]]) -> str:
+        client = self.batch_client
+        lines = [
+            json_compact(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [
+                            {"role": "system", "content": system},
+                            {"role": "user", "content": user},
+                        ],
+                    },
+                }
+            )
+            for custom_id, system, user, _ in pending
+        ]
+        batch_input = client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def _collect_batch(self, batch_id: str, futures: Dict[str, Future]) -> bool:
+        """Resolve ``futures`` if the batch has finished; return whether it has."""
+
+        client = self.batch_client
+        batch = client.batches.retrieve(batch_id)
+        if batch.status not in self._TERMINAL_STATUSES:
+            return False
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} finished with status '{batch.status}'")
+
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json_loads(line)
+                future = futures.pop(record.get("custom_id"), None)
+                if future is None:
+                    continue
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    message = response["body"]["choices"][0]["message"]["content"]
+                    _settle(future, result=message or "")
+                else:
+                    _settle(future, exc=RuntimeError(f"Batch request failed: {record.get('error') or response}"))
+
+        for future in futures.values():
+            _settle(future, exc=RuntimeError(f"Batch {batch.id} returned no result for this request"))
+        return True
+
+
+def _settle(future: Future, result: Any = None, exc: Optional[BaseException] = None) -> None:
+    """Complete ``future`` unless another thread (e.g. ``close``) already did."""
+
+    try:
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+DEFAULT_LLM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agent_framework", "llm")
+
+
+def llm_cache_key(model: str, system: str, user: str) -> str:
+    """Return a compact digest identifying a ``(model, system, user)`` prompt."""
+
+    payload = f"{model}\0{system}\0{user}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class CachingLLMClient:
+    """Exact-match response cache wrapped around another ``LLMClient``.
+
+    Responses are kept in a process-local LRU keyed by ``llm_cache_key``.
+    When ``cache_dir`` is given the LRU is backed by a ``shelve`` database so
+    responses are reused across runs. Pass ``bypass=True`` to ``chat`` for
+    calls that must always reach the wrapped client.
+    """
+
+    def __init__(self, inner: LLMClient, maxsize: int = 4096, cache_dir: Optional[str] = None) -> None:
+        self.inner = inner
+        self.model = getattr(inner, "model", type(inner).__name__)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[shelve.Shelf] = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk = shelve.open(os.path.join(cache_dir, "responses"))
+
+    def chat(self, system: str, user: str, *, bypass: bool = False) -> str:
+        if bypass:
+            if isinstance(self.inner, SemanticLLMCache):
+                return self.inner.chat(system=system, user=user, bypass=True)
+            return self.inner.chat(system=system, user=user)
+
+        key = llm_cache_key(self.model, system, user)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.inner.chat(system=system, user=user)
+        self._store(key, response)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+        inner_close = getattr(self.inner, "close", None)
+        if inner_close is not None:
+            inner_close()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+            elif self._disk is not None:
+                cached = self._disk.get(key)
+                if cached is not None:
+                    self._remember(key, cached)
+
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cached
+
+    def _store(self, key: str, response: str) -> None:
+        with self._lock:
+            self._remember(key, response)
+            if self._disk is not None:
+                self._disk[key] = response
+
+    def _remember(self, key: str, response: str) -> None:
+        self._lru[key] = response
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Any:
+    if importlib.util.find_spec("sentence_transformers") is None:
+        raise RuntimeError("The 'sentence-transformers' package is required for local embeddings")
+
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    return SentenceTransformer(model_name)
+
+
+def embed_text(text: str) -> "np.ndarray":
+    """Embed ``text`` with the shared local sentence-transformer model."""
+
+    vector = _get_embedder().encode(text, convert_to_numpy=True)
+    return np.asarray(vector, dtype=np.float32)
+
+
+def _default_embed_fn() -> Optional[Callable[[str], Any]]:
+    """Return ``embed_text`` when its optional dependencies are installed."""
+
+    if np is None or importlib.util.find_spec("sentence_transformers") is None:
+        return None
+    return embed_text
+
+
+def _normalize(vector: "np.ndarray") -> "np.ndarray":
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class _SemanticScope:
+    """Embeddings and responses for one ``(model, system)`` pair."""
+
+    def __init__(self, dim: int) -> None:
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.responses: List[str] = []
+        self.next_slot = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.responses)
+
+
+class SemanticLLMCache:
+    """Nearest-neighbour response cache that also matches paraphrased prompts.
+
+    Each ``(model, sha1(system))`` scope stores L2-normalised embeddings of
+    previous ``user`` prompts in one contiguous ``(N, d)`` float32 array, so a
+    lookup is a single matrix-vector product. A prompt whose cosine
+    similarity to a stored prompt reaches ``threshold`` is answered from the
+    cache. Once a scope holds ``max_entries`` prompts the oldest is
+    overwritten. Requires ``numpy``; ``embed_fn`` defaults to ``embed_text``,
+    which needs ``sentence-transformers``. With ``cache_dir`` the entries are
+    loaded on construction and written back by ``close()``.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient,
+        embed_fn: Optional[Callable[[str], Any]] = None,
+        threshold: float = 0.93,
+        max_entries: int = 10000,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("The 'numpy' package is required for SemanticLLMCache")
+        if embed_fn is None:
+            embed_fn = _default_embed_fn()
+            if embed_fn is None:
+                raise RuntimeError(
+                    "SemanticLLMCache needs an embed_fn or the 'sentence-transformers' package"
+                )
+
+        self.inner = inner
+        self.model = getattr(inner, "model", type(inner).__name__)
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._scopes: Dict[Tuple[str, str], _SemanticScope] = {}
+        self._lock = threading.Lock()
+        if cache_dir:
+            self._load()
+
+    def chat(self, system: str, user: str, *, bypass: bool = False) -> str:
+        if bypass:
+            return self.inner.chat(system=system, user=user)
+
+        scope_key = (self.model, hashlib.sha1(system.encode("utf-8")).hexdigest())
+        vector = _normalize(self.embed_fn(user))
+
+        with self._lock:
+            cached = self._search(scope_key, vector)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if cached is not None:
+            return cached
+
+        response = self.inner.chat(system=system, user=user)
+        with self._lock:
+            self._add(scope_key, vector, response)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self.cache_dir:
+            with self._lock:
+                self._save()
+
+    def _search(self, scope_key: Tuple[str, str], vector: "np.ndarray") -> Optional[str]:
+        scope = self._scopes.get(scope_key)
+        if scope is None or scope.size == 0 or scope.vectors.shape[1] != vector.shape[0]:
+            return None
+        sims = scope.vectors[: scope.size] @ vector
+        best = int(np.argmax(sims))
+        if sims[best] >= self.threshold:
+            return scope.responses[best]
+        return None
+
+    def _add(self, scope_key: Tuple[str, str], vector: "np.ndarray", response: str) -> None:
+        scope = self._scopes.get(scope_key)
+        if scope is None:
+            scope = self._scopes[scope_key] = _SemanticScope(vector.shape[0])
+
+        if scope.size < self.max_entries:
+            slot = scope.size
+            if slot == scope.vectors.shape[0]:
+                capacity = min(max(2 * slot, 64), self.max_entries)
+                grown = np.empty((capacity, scope.vectors.shape[1]), dtype=np.float32)
+                grown[:slot] = scope.vectors
+                scope.vectors = grown
+            scope.responses.append(response)
+        else:
+            slot = scope.next_slot
+            scope.next_slot = (slot + 1) % self.max_entries
+            scope.responses[slot] = response
+        scope.vectors[slot] = vector
+
+    def _scope_path(self, scope_key: Tuple[str, str]) -> str:
+        digest = hashlib.sha1("\0".join(scope_key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir or "", digest)
+
+    def _save(self) -> None:
+        os.makedirs(self.cache_dir or "", exist_ok=True)
+        for scope_key, scope in self._scopes.items():
+            path = self._scope_path(scope_key)
+            np.save(path + ".npy", scope.vectors[: scope.size])
+            with open(path + ".json", "w", encoding="utf-8") as fh:
+                fh.write(
+                    json_compact({"scope": list(scope_key), "responses": scope.responses, "next_slot": scope.next_slot})
+                )
+
+    def _load(self) -> None:
+        if not os.path.isdir(self.cache_dir or ""):
+            return
+        for name in os.listdir(self.cache_dir or ""):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir or "", name[: -len(".json")])
+            with open(path + ".json", "rb") as fh:
+                meta = json_loads(fh.read())
+            vectors = np.load(path + ".npy")
+            scope = _SemanticScope(vectors.shape[1])
+            scope.responses = meta["responses"][: self.max_entries]
+            scope.vectors = np.ascontiguousarray(vectors[: scope.size], dtype=np.float32)
+            scope.next_slot = meta["next_slot"] % self.max_entries
+            self._scopes[(meta["scope"][0], meta["scope"][1])] = scope
+
+
 # =========================
 # Memory layer
 # =========================
 
 
+@functools.lru_cache(maxsize=1)
+def _get_faiss() -> Any:
+    """Return the ``faiss`` module, or ``None`` when it is not installed."""
+
+    if importlib.util.find_spec("faiss") is None:
+        return None
+
+    import faiss  # type: ignore
+
+    return faiss
+
+
+@functools.lru_cache(maxsize=1)
+def _get_vector_ops() -> Any:
+    """Return the numba-backed ``vector_ops`` module, or ``None`` without numba."""
+
+    if np is None or importlib.util.find_spec("numba") is None:
+        return None
+
+    import vector_ops
+
+    return vector_ops if vector_ops.HAVE_NUMBA else None
+
+
+def _format_epoch(timestamp: float) -> str:
+    """Format a ``time.time()`` value like ``now_iso``."""
+
+    prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp))
+    return f"{prefix}.{int(timestamp % 1 * 1_000_000):06d}Z"
+
+
 class SimpleVectorStore:
-    """Very naive "vector store": just keeps text and returns everything."""
+    """In-memory vector store with cosine-similarity search.
+
+    Each namespace is stored as parallel arrays: ``texts`` (list of str),
+    ``ts`` (``array('d')`` of epoch seconds) and ``vecs``, a contiguous
+    ``(capacity, d)`` float32 matrix of L2-normalised embeddings that doubles
+    when full. A search is a single matrix-vector product followed by
+    ``np.argpartition``, and result dicts are only built for the top hits.
+    Once a namespace reaches ``hnsw_threshold`` items and ``faiss`` is
+    installed, searches switch to an HNSW index for sub-linear approximate
+    lookups. Exact searches over more than ``_NUMBA_MIN_ELEMENTS`` matrix
+    elements use the numba kernel in ``vector_ops`` when available. Without
+    an ``embed_fn`` (or without numpy) ``search`` returns the most recent items.
+    """
 
-    def __init__(self) -> None:
-        self.data: Dict[str, List[Dict[str, Any]]] = {}
+    _MIN_CAPACITY = 64
+    _NUMBA_MIN_ELEMENTS = 2_000_000
+    _HNSW_NEIGHBORS = 32
+    _HNSW_EF_SEARCH = 64
+
+    def __init__(self, embed_fn: Optional[Callable[[str], Any]] = None, hnsw_threshold: int = 10000) -> None:
+        self.embed_fn = embed_fn if np is not None else None
+        self.hnsw_threshold = hnsw_threshold
+        self.data: Dict[str, SimpleNamespace] = {}
 
     def add(self, namespace: str, text: str) -> None:
-        self.data.setdefault(namespace, []).append({"text": text, "timestamp": now_iso()})
+        # Embed first so a failing embedder leaves the namespace untouched
+        # rather than holding a row whose vector was never written.
+        vector = _normalize(self.embed_fn(text)) if self.embed_fn is not None else None
+
+        ns = self.data.get(namespace)
+        if ns is None:
+            ns = self.data[namespace] = SimpleNamespace(texts=[], ts=array("d"), vecs=None, index=None)
+        row = len(ns.texts)
+        if vector is not None:
+            if ns.vecs is None or row == ns.vecs.shape[0]:
+                capacity = max(2 * row, self._MIN_CAPACITY)
+                grown = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+                if ns.vecs is not None:
+                    grown[:row] = ns.vecs[:row]
+                ns.vecs = grown
+            ns.vecs[row] = vector
+        ns.texts.append(text)
+        ns.ts.append(time.time())
+        if vector is None:
+            return
+
+        if ns.index is not None:
+            ns.index.add(vector[None, :])
+        elif row + 1 >= self.hnsw_threshold and _get_faiss() is not None:
+            ns.index = self._build_index(ns.vecs[: row + 1])
 
     def search(self, namespace: str, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        all_items = self.data.get(namespace, [])
-        return all_items[-top_k:]
+        ns = self.data.get(namespace)
+        count = len(ns.texts) if ns is not None else 0
+        if count == 0 or top_k <= 0:
+            return []
+        if self.embed_fn is None:
+            return self._records(ns, range(max(count - top_k, 0), count))
+
+        query_vec = _normalize(self.embed_fn(query))
+        if ns.index is not None:
+            ns.index.hnsw.efSearch = max(self._HNSW_EF_SEARCH, top_k)
+            _, ids = ns.index.search(query_vec[None, :], min(top_k, count))
+            return self._records(ns, (int(i) for i in ids[0] if i >= 0))
+
+        matrix = ns.vecs[:count]
+        vector_ops = _get_vector_ops() if matrix.size > self._NUMBA_MIN_ELEMENTS else None
+        if vector_ops is not None:
+            ids, _ = vector_ops.topk_cosine(matrix, query_vec, top_k)
+            return self._records(ns, (int(i) for i in ids))
+
+        sims = matrix @ query_vec
+        if top_k < count:
+            idx = np.argpartition(-sims, top_k)[:top_k]
+        else:
+            idx = np.arange(count)
+        idx = idx[np.argsort(-sims[idx], kind="stable")]
+        return self._records(ns, (int(i) for i in idx))
+
+    @staticmethod
+    def _records(ns: SimpleNamespace, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        return [{"text": ns.texts[i], "timestamp": _format_epoch(ns.ts[i])} for i in rows]
+
+    def _build_index(self, vectors: "np.ndarray") -> Any:
+        faiss = _get_faiss()
+        index = faiss.IndexHNSWFlat(vectors.shape[1], self._HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+        index.add(np.ascontiguousarray(vectors))
+        return index
 
 
 class SimpleKVStore:
@@ -260,7 +1004,7 @@ class MemoryLayer:
             "result": step.result,
             "timestamp": now_iso(),
         }
-        self.vector.add(namespace=user_id, text=json_dump(record))
+        self.vector.add(namespace=user_id, text=json_compact(record))
 
     def set_fact(self, user_id: str, key: str, value: Any) -> None:
         self.kv.set(f"{user_id}:{key}", value)
@@ -285,12 +1029,220 @@ class SafetyManager:
         return result
 
 
+# =========================
+# Checkpoints
+# =========================
+
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "database", "agent_checkpoints.db"
+)
+
+
+class CheckpointStore:
+    """SQLite record of finished plan steps so an interrupted task can resume.
+
+    Rows are keyed by ``(objective_hash, step_idx)``, where the hash covers the
+    user id and objective. Because plans are regenerated on every run, a
+    stored result is only reused when the step description still matches.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ckpt("
+                "objective_hash TEXT, step_idx INTEGER, description TEXT, result BLOB, status TEXT, "
+                "PRIMARY KEY(objective_hash, step_idx))"
+            )
+
+    @staticmethod
+    def task_key(task: Task) -> str:
+        payload = f"{task.user_id}\0{task.objective}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def load(self, key: str, step_idx: int, description: str) -> Optional[Tuple[Any]]:
+        """Return ``(result,)`` for a finished step, or ``None`` when there is none."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT description, result FROM ckpt WHERE objective_hash = ? AND step_idx = ? AND status = ?",
+                (key, step_idx, StepStatus.DONE),
+            ).fetchone()
+        if row is None or row[0] != description:
+            return None
+        return (json_loads(row[1]),)
+
+    def save(self, key: str, step_idx: int, step: Step) -> bool:
+        """Record ``step``; returns ``False`` when its result is not JSON-serializable."""
+
+        try:
+            result = json_compact(step.result).encode("utf-8")
+        except TypeError:
+            return False
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ckpt(objective_hash, step_idx, description, result, status) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, step_idx, step.description, result, step.status),
+            )
+        return True
+
+    def clear(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ckpt WHERE objective_hash = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# =========================
+# Prompts
+# =========================
+
+# System prompts are module-level constants so every call sends a
+# byte-identical prefix that provider-side prompt caches can reuse. User
+# payloads put task-stable fields (objective) before per-step fields, and
+# never include timestamps or other per-run values.
+
+_PLANNER_SYSTEM = (
+    "You are a planner. Given a user objective and context, break it "
+    "into 2–5 concrete steps. For each, choose an agent from: "
+    "['research', 'code', 'comms']. "
+    "Respond ONLY as strict JSON: "
+    "{ \"steps\": [ {\"description\": \"...\", \"agent_name\": \"...\"}, ... ] }"
+)
+
+_RESEARCH_SYSTEM = (
+    "You are a research agent. Decide what to search, read results, "
+    "and synthesize them into a concise, useful report."
+)
+
+_SYNTHESIS_SYSTEM = "You are a synthesis engine. Combine sources into a report."
+
+_CODE_SYSTEM = (
+    "You are a senior software engineer. Given the task and context, "
+    "describe what code changes or checks you would perform. "
+    "You may request tests or static analysis, but this environment "
+    "only simulates execution."
+)
+
+_COMMS_SYSTEM = (
+    "You are a communications agent. Turn the prior step results into a "
+    "clear, concise explanation for a non-technical stakeholder."
+)
+
+_SUMMARY_SYSTEM = (
+    "You are a senior analyst. Given the objective and the list of "
+    "steps+results, produce a clear, actionable final answer."
+)
+
+_CONDENSE_SYSTEM = (
+    "You are a summarizer. Condense the step result into its key facts, "
+    "decisions and open questions, in at most a few short paragraphs."
+)
+
+_SYSTEM_PROMPTS = (
+    _PLANNER_SYSTEM,
+    _RESEARCH_SYSTEM,
+    _SYNTHESIS_SYSTEM,
+    _CODE_SYSTEM,
+    _COMMS_SYSTEM,
+    _SUMMARY_SYSTEM,
+    _CONDENSE_SYSTEM,
+)
+
+# Editing any system prompt invalidates every provider-side prompt cache
+# entry built on it. The test suite pins this digest so such edits are
+# deliberate: update it together with the prompt.
+_SYSTEM_PROMPT_HASH = "sha256:9ea531febc808d30cc695d30d0d887d9d83314468e2d01446bcf03c441dd0a92"
+
+
+def _system_prompt_digest() -> str:
+    joined = "\0".join(_SYSTEM_PROMPTS)
+    return "sha256:" + hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+# =========================
+# Prompt budgeting
+# =========================
+
+# Results longer than this are condensed by the LLM once (cached on
+# ``Step.summary``) before being truncated to the per-result limit.
+PRIOR_RESULT_SUMMARY_CHARS = 3200
+
+
+@functools.lru_cache(maxsize=1)
+def _get_token_encoder() -> Any:
+    if importlib.util.find_spec("tiktoken") is None:
+        return None
+
+    import tiktoken  # type: ignore
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken's ``cl100k_base``, or estimate ~4 chars/token."""
+
+    encoder = _get_token_encoder()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def _fit_budget(
+    steps: List[Step],
+    llm: Optional[LLMClient] = None,
+    max_tokens: int = 4000,
+    max_per_result: int = 800,
+) -> List[Dict[str, Any]]:
+    """Return ``{"description", "result"}`` entries for ``steps`` within a token budget.
+
+    Each result is condensed via ``llm`` when very long, then truncated to
+    ``max_per_result`` characters. Entries are admitted newest-first, so the
+    oldest ones are dropped once ``max_tokens`` is used up.
+    """
+
+    fitted: List[Dict[str, Any]] = []
+    remaining = max_tokens
+    for step in reversed(steps):
+        result = step.result
+        if result is not None:
+            text = result if isinstance(result, str) else json_compact(result)
+            if len(text) > PRIOR_RESULT_SUMMARY_CHARS and llm is not None:
+                if step.summary is None:
+                    step.summary = llm.chat(system=_CONDENSE_SYSTEM, user=text)
+                text = step.summary
+            if len(text) > max_per_result:
+                text = text[:max_per_result] + "…"
+            result = text
+
+        cost = count_tokens(step.description) + (count_tokens(result) if result is not None else 0)
+        if cost > remaining:
+            break
+        remaining -= cost
+        fitted.append({"description": step.description, "result": result})
+
+    fitted.reverse()
+    return fitted
+
+
 # =========================
 # Base Agent + concrete agents
 # =========================
 
 
 class BaseAgent(abc.ABC):
+    # Agents that read earlier step results must run after those steps; all
+    # others may run concurrently with their neighbours in the plan.
+    depends_on_prior: bool = False
+
     def __init__(self, name: str, llm_client: LLMClient, tools: ToolRegistry, memory: MemoryLayer) -> None:
         self.name = name
         self.llm = llm_client
@@ -301,25 +1253,33 @@ class BaseAgent(abc.ABC):
     def run(self, step: Step, task: Task) -> Any:
         raise NotImplementedError
 
+    def _resolve_tool(self, name: str) -> Callable[..., Any]:
+        """Bind a tool once at construction; defer to the registry if it is not registered yet."""
+
+        fn = self.tools.tools.get(name)
+        if fn is None or inspect.iscoroutinefunction(fn):
+            # The registry drives coroutine tools on the shared tool loop.
+            return functools.partial(self.tools.call, name)
+        return fn
+
 
 class ResearchAgent(BaseAgent):
-    def run(self, step: Step, task: Task) -> Any:
-        system_prompt = (
-            "You are a research agent. Decide what to search, read results, "
-            "and synthesize them into a concise, useful report."
-        )
+    def __init__(self, name: str, llm_client: LLMClient, tools: ToolRegistry, memory: MemoryLayer) -> None:
+        super().__init__(name, llm_client, tools, memory)
+        self._web_search = self._resolve_tool("web_search")
 
+    def run(self, step: Step, task: Task) -> Any:
         planning_resp = self.llm.chat(
-            system=system_prompt,
+            system=_RESEARCH_SYSTEM,
             user=f"Objective: {task.objective}\nStep: {step.description}",
         )
 
         query = task.objective[:200]
-        results = self.tools.call("web_search", query=query, max_results=3)
+        results = self._web_search(query=query, max_results=3)
 
         fusion_resp = self.llm.chat(
-            system="You are a synthesis engine. Combine sources into a report.",
-            user=json_dump(
+            system=_SYNTHESIS_SYSTEM,
+            user=json_compact(
                 {
                     "objective": task.objective,
                     "step": step.description,
@@ -332,40 +1292,30 @@ class ResearchAgent(BaseAgent):
 
 
 class CodeAgent(BaseAgent):
-    def run(self, step: Step, task: Task) -> Any:
-        system_prompt = (
-            "You are a senior software engineer. Given the task and context, "
-            "describe what code changes or checks you would perform. "
-            "You may request tests or static analysis, but this environment "
-            "only simulates execution."
-        )
+    def __init__(self, name: str, llm_client: LLMClient, tools: ToolRegistry, memory: MemoryLayer) -> None:
+        super().__init__(name, llm_client, tools, memory)
+        self._run_code = self._resolve_tool("run_code")
 
+    def run(self, step: Step, task: Task) -> Any:
         resp = self.llm.chat(
-            system=system_prompt,
+            system=_CODE_SYSTEM,
             user=f"Objective: {task.objective}\nStep: {step.description}",
         )
 
-        fake_test_result = self.tools.call("run_code", language="bash", code="pytest -q")
+        fake_test_result = self._run_code(language="bash", code="pytest -q")
 
         return "CODE ANALYSIS (SIMULATED):\n" + resp + "\n\nTEST RUN (SIMULATED):\n" + json_dump(fake_test_result)
 
 
 class CommsAgent(BaseAgent):
-    def run(self, step: Step, task: Task) -> Any:
-        system_prompt = (
-            "You are a communications agent. Turn the prior step results into a "
-            "clear, concise explanation for a non-technical stakeholder."
-        )
+    depends_on_prior = True
 
-        prior_results = [
-            {"description": s.description, "result": s.result}
-            for s in task.plan
-            if s.result is not None
-        ]
+    def run(self, step: Step, task: Task) -> Any:
+        prior_results = _fit_budget([s for s in task.plan if s.result is not None], self.llm)
 
         resp = self.llm.chat(
-            system=system_prompt,
-            user=json_dump(
+            system=_COMMS_SYSTEM,
+            user=json_compact(
                 {
                     "objective": task.objective,
                     "step": step.description,
@@ -380,69 +1330,176 @@ class CommsAgent(BaseAgent):
 # Orchestrator
 # =========================
 
+# Reuse the result of an earlier step with the same agent and description
+# instead of running it again within one task.
+ENABLE_INTRA_TASK_DEDUP = True
+
 
 class Orchestrator:
-    def __init__(self, llm_client: LLMClient, agents: Dict[str, BaseAgent], memory: MemoryLayer, safety: SafetyManager) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        agents: Dict[str, BaseAgent],
+        memory: MemoryLayer,
+        safety: SafetyManager,
+        max_workers: int = 4,
+        checkpoints: Optional[CheckpointStore] = None,
+    ) -> None:
         self.llm = llm_client
         self.agents = agents
         self.memory = memory
         self.safety = safety
+        self.max_workers = max_workers
+        self.checkpoints = checkpoints
+
+    def close(self) -> None:
+        """Flush disk-backed LLM caches and close the checkpoint store."""
+
+        llm_close = getattr(self.llm, "close", None)
+        if llm_close is not None:
+            llm_close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
 
     def handle_task(self, task: Task) -> Task:
+        cache_stats = getattr(self.llm, "stats", None)
+        stats_before = cache_stats() if cache_stats else None
+
         long_term = self.memory.retrieve_relevant(task.user_id, task.objective)
         task.context["memory"] = long_term
 
         task.plan = self._create_plan(task)
 
-        for step in task.plan:
-            if not self.safety.allowed_to_proceed(task, step):
-                step.status = StepStatus.BLOCKED
-                task.append_log(f"Step blocked by safety: {step.description}")
-                break
+        # (agent_name, description) -> first step that ran it. Only agents that
+        # ignore earlier results are memoised, since their output cannot change
+        # later within the same task.
+        first_runs: Dict[Tuple[str, str], Step] = {}
+        step_indices = {id(step): idx for idx, step in enumerate(task.plan)}
+        checkpoint_key = CheckpointStore.task_key(task) if self.checkpoints is not None else None
+
+        for wave in self._plan_waves(task.plan):
+            runnable: List[Tuple[Step, BaseAgent]] = []
+            duplicates: List[Tuple[Step, Step]] = []
+            stop = False
+            for step in wave:
+                if not self.safety.allowed_to_proceed(task, step):
+                    step.status = StepStatus.BLOCKED
+                    task.append_log(f"Step blocked by safety: {step.description}")
+                    stop = True
+                    break
+
+                agent = self.agents.get(step.agent_name)
+                if agent is None:
+                    step.status = StepStatus.ERROR
+                    task.append_log(f"No agent found: {step.agent_name}")
+                    continue
 
-            agent = self.agents.get(step.agent_name)
-            if agent is None:
-                step.status = StepStatus.ERROR
-                task.append_log(f"No agent found: {step.agent_name}")
-                continue
+                step.mark_started()
+                if checkpoint_key is not None:
+                    restored = self.checkpoints.load(checkpoint_key, step_indices[id(step)], step.description)
+                    if restored is not None:
+                        step.result = restored[0]
+                        step.status = StepStatus.DONE
+                        step.mark_finished(duration=0.0)
+                        task.append_log(f"Restored step from checkpoint: {step.description}")
+                        if ENABLE_INTRA_TASK_DEDUP and not agent.depends_on_prior:
+                            first_runs.setdefault((step.agent_name, step.description), step)
+                        continue
+
+                if ENABLE_INTRA_TASK_DEDUP and not agent.depends_on_prior:
+                    key = (step.agent_name, step.description)
+                    original = first_runs.get(key)
+                    if original is not None:
+                        duplicates.append((step, original))
+                        continue
+                    first_runs[key] = step
+
+                task.append_log(f"Running step via agent '{step.agent_name}': {step.description}")
+                runnable.append((step, agent))
+
+            # Task state is only mutated here, after the wave has joined, so
+            # worker threads never race on ``task.logs`` or ``task.plan``.
+            for (step, agent), (result, error, elapsed) in zip(runnable, self._run_wave(runnable, task)):
+                if error is not None:
+                    step.result = f"Agent '{agent.name}' failed: {error}"
+                    step.status = StepStatus.ERROR
+                    step.mark_finished(duration=elapsed)
+                    task.status = TaskStatus.ERROR
+                    task.append_log(step.result)
+                    stop = True
+                    continue
 
-            task.append_log(f"Running step via agent '{step.agent_name}': {step.description}")
-            step.mark_started()
-            start = time.time()
+                step.result = self.safety.post_process(result)
+                step.status = StepStatus.DONE
+                step.mark_finished(duration=elapsed)
+                task.append_log(f"Step completed in {elapsed:.2f}s: {step.description}")
 
-            try:
-                result = agent.run(step, task)
-            except Exception as exc:  # pragma: no cover - defensive guard
-                step.result = f"Agent '{agent.name}' failed: {exc}"
-                step.status = StepStatus.ERROR
-                step.mark_finished(duration=time.time() - start)
-                task.status = TaskStatus.ERROR
-                task.append_log(step.result)
-                break
+                self.memory.store_intermediate(task.user_id, task.objective, step)
+                if checkpoint_key is not None:
+                    self.checkpoints.save(checkpoint_key, step_indices[id(step)], step)
 
-            elapsed = time.time() - start
-            step.result = self.safety.post_process(result)
-            step.status = StepStatus.DONE
-            step.mark_finished(duration=elapsed)
-            task.append_log(f"Step completed in {elapsed:.2f}s: {step.description}")
+            for step, original in duplicates:
+                step.result = original.result
+                step.status = original.status
+                step.mark_finished(duration=0.0)
+                task.append_log(f"Dedup hit, reused result of identical step: {step.description}")
 
-            self.memory.store_intermediate(task.user_id, task.objective, step)
+            if stop:
+                break
 
         final_answer = self._summarize_results(task)
         task.context["final_answer"] = final_answer
         task.status = TaskStatus.COMPLETED
+        if checkpoint_key is not None and all(s.status == StepStatus.DONE for s in task.plan):
+            # Checkpoints exist to resume interrupted runs, not to cache
+            # finished ones; a fully completed task starts fresh next time.
+            self.checkpoints.clear(checkpoint_key)
+
+        if stats_before is not None:
+            stats_after = cache_stats()
+            hits = stats_after["hits"] - stats_before["hits"]
+            misses = stats_after["misses"] - stats_before["misses"]
+            task.append_log(f"LLM cache: {hits} hits, {misses} misses")
         return task
 
-    def _create_plan(self, task: Task) -> List[Step]:
-        system_prompt = (
-            "You are a planner. Given a user objective and context, break it "
-            "into 2–5 concrete steps. For each, choose an agent from: "
-            "['research', 'code', 'comms']. "
-            "Respond ONLY as strict JSON: "
-            "{ \"steps\": [ {\"description\": \"...\", \"agent_name\": \"...\"}, ... ] }"
-        )
+    def _plan_waves(self, plan: List[Step]) -> List[List[Step]]:
+        """Group consecutive independent steps so each group can run concurrently."""
+
+        waves: List[List[Step]] = []
+        current: List[Step] = []
+        for step in plan:
+            agent = self.agents.get(step.agent_name)
+            if agent is not None and agent.depends_on_prior:
+                if current:
+                    waves.append(current)
+                    current = []
+                waves.append([step])
+            else:
+                current.append(step)
+        if current:
+            waves.append(current)
+        return waves
+
+    def _run_wave(
+        self, runnable: List[Tuple[Step, BaseAgent]], task: Task
+    ) -> List[Tuple[Any, Optional[BaseException], float]]:
+        """Run a wave of steps, returning ``(result, error, elapsed)`` per step."""
+
+        def run_step(item: Tuple[Step, BaseAgent]) -> Tuple[Any, Optional[BaseException], float]:
+            step, agent = item
+            start = time.time()
+            try:
+                return agent.run(step, task), None, time.time() - start
+            except Exception as exc:  # pragma: no cover - defensive guard
+                return None, exc, time.time() - start
 
-        resp = self.llm.chat(system=system_prompt, user=task.objective)
+        if len(runnable) <= 1 or self.max_workers <= 1:
+            return [run_step(item) for item in runnable]
+        with ThreadPoolExecutor(max_workers=min(len(runnable), self.max_workers)) as executor:
+            return list(executor.map(run_step, runnable))
+
+    def _create_plan(self, task: Task) -> List[Step]:
+        resp = self.llm.chat(system=_PLANNER_SYSTEM, user=task.objective)
         steps: List[Step] = []
         try:
             parsed = parse_json(resp)
@@ -460,19 +1517,11 @@ class Orchestrator:
         return steps
 
     def _summarize_results(self, task: Task) -> str:
-        system_prompt = (
-            "You are a senior analyst. Given the objective and the list of "
-            "steps+results, produce a clear, actionable final answer."
-        )
-
-        steps_summary = [
-            {"description": s.description, "result": s.result}
-            for s in task.plan
-        ]
+        steps_summary = _fit_budget(task.plan, self.llm)
 
         resp = self.llm.chat(
-            system=system_prompt,
-            user=json_dump({"objective": task.objective, "steps": steps_summary}),
+            system=_SUMMARY_SYSTEM,
+            user=json_compact({"objective": task.objective, "steps": steps_summary}),
         )
         return resp
 
@@ -482,15 +1531,41 @@ class Orchestrator:
 # =========================
 
 
-def build_default_system(llm_client: Optional[LLMClient] = None) -> Orchestrator:
+def build_default_system(
+    llm_client: Optional[LLMClient] = None,
+    llm_cache_dir: Optional[str] = None,
+    semantic_cache_threshold: Optional[float] = None,
+    semantic_cache_max_entries: int = 10000,
+    checkpoint_path: Optional[str] = None,
+) -> Orchestrator:
+    """Wire up the default agents around a response-caching LLM client.
+
+    Pass ``llm_cache_dir`` (e.g. ``DEFAULT_LLM_CACHE_DIR``) to persist cached
+    responses across runs; by default the cache is in-memory only. Setting
+    ``semantic_cache_threshold`` layers a ``SemanticLLMCache`` under the
+    exact-match cache so paraphrased prompts are answered from it as well.
+    Pass ``checkpoint_path`` (e.g. ``DEFAULT_CHECKPOINT_PATH``) to checkpoint
+    finished steps in SQLite so a crashed task resumes where it stopped.
+    Call ``Orchestrator.close()`` when done; semantic cache entries are only
+    written to ``llm_cache_dir`` at that point.
+    """
+
     llm_client = llm_client or DummyLLMClient()
+    if semantic_cache_threshold is not None:
+        llm_client = SemanticLLMCache(
+            llm_client,
+            threshold=semantic_cache_threshold,
+            max_entries=semantic_cache_max_entries,
+            cache_dir=os.path.join(llm_cache_dir, "semantic") if llm_cache_dir else None,
+        )
+    llm_client = CachingLLMClient(llm_client, cache_dir=llm_cache_dir)
 
     tools = ToolRegistry()
     tools.register("web_search", web_search_tool)
     tools.register("read_file", read_file_tool)
     tools.register("run_code", run_code_tool)
 
-    vector_store = SimpleVectorStore()
+    vector_store = SimpleVectorStore(embed_fn=_default_embed_fn())
     kv_store = SimpleKVStore()
     memory_layer = MemoryLayer(vector_store, kv_store)
 
@@ -502,7 +1577,9 @@ def build_default_system(llm_client: Optional[LLMClient] = None) -> Orchestrator
         "comms": CommsAgent("comms", llm_client, tools, memory_layer),
     }
 
-    orchestrator = Orchestrator(llm_client, agents, memory_layer, safety)
+    checkpoints = CheckpointStore(checkpoint_path) if checkpoint_path else None
+
+    orchestrator = Orchestrator(llm_client, agents, memory_layer, safety, checkpoints=checkpoints)
     return orchestrator
 
 
@@ -514,6 +1591,7 @@ if __name__ == "__main__":
     # >>> task = Task(user_id="user-123", objective="Audit this codebase for security issues.")
     # >>> completed = orch.handle_task(task)
     # >>> print(completed.context["final_answer"])
+    # >>> orch.close()
 
     orch = build_default_system()
 
@@ -522,7 +1600,10 @@ if __name__ == "__main__":
         objective="Audit this codebase for obvious security issues and draft a remediation plan.",
     )
 
-    completed = orch.handle_task(task)
+    try:
+        completed = orch.handle_task(task)
+    finally:
+        orch.close()
 
     print("=== FINAL ANSWER ===")
     print(completed.context["final_answer"])
@@ -1,13 +1,33 @@
+import hashlib
 import json
 import os
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import re
+import stat
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
 try:  # pragma: no cover - exercised indirectly in tests
     from flask import Flask, jsonify, send_from_directory  # type: ignore
+    from werkzeug.exceptions import NotFound  # type: ignore
     _USING_FLASK = True
 except ModuleNotFoundError:  # pragma: no cover - exercised indirectly in tests
     _USING_FLASK = False
 
+    class NotFound(Exception):  # type: ignore[no-redef]
+        """Never raised: the fallback ``send_from_directory`` returns a 404 response."""
+
+    def _json_bytes(body: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        return json.dumps(body).encode("utf-8")
+
     class SimpleResponse:
         """Minimal response object compatible with the subset used in tests."""
 
@@ -26,7 +46,7 @@ except ModuleNotFoundError:  # pragma: no cover - exercised indirectly in tests
             if isinstance(body, bytes):
                 payload = body
             elif json_body:
-                payload = json.dumps(body).encode("utf-8")
+                payload = _json_bytes(body)
             else:
                 payload = str(body).encode("utf-8")
 
@@ -161,12 +181,95 @@ except ModuleNotFoundError:  # pragma: no cover - exercised indirectly in tests
             payload = kwargs
         return SimpleResponse(payload, json_body=True)
 
-    def send_from_directory(directory: str, filename: str) -> SimpleResponse:  # type: ignore[misc]
+    # file path -> ((mtime_ns, size), body, etag); entries are re-read when the
+    # file's mtime or size changes.
+    _file_cache: Dict[str, Tuple[Tuple[int, int], bytes, str]] = {}
+
+    def send_from_directory(  # type: ignore[misc]
+        directory: str, filename: str, max_age: Optional[int] = None
+    ) -> SimpleResponse:
         file_path = os.path.join(directory, filename)
-        if not os.path.isfile(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
             return SimpleResponse("File not found", status=404)
-        with open(file_path, "rb") as fh:
-            return SimpleResponse(fh.read(), status=200)
+        if not stat.S_ISREG(st.st_mode):
+            return SimpleResponse("File not found", status=404)
+
+        version = (st.st_mtime_ns, st.st_size)
+        cached = _file_cache.get(file_path)
+        if cached is None or cached[0] != version:
+            with open(file_path, "rb") as fh:
+                body = fh.read()
+            cached = (version, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+            _file_cache[file_path] = cached
+
+        headers = {"ETag": f'"{cached[2]}"'}
+        if max_age is not None:
+            headers["Cache-Control"] = f"public, max-age={max_age}"
+        return SimpleResponse(cached[1], status=200, headers=headers)
+
+
+# Seconds browsers may reuse static assets before revalidating them.
+STATIC_MAX_AGE = 300
+
+# Resolved once at import so create_app() does no path work or syscalls.
+_BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+_DB_DIR = os.path.join(_BASE_DIR, 'database')
+_STATIC_DIR = os.path.join(_BASE_DIR, 'static')
+os.makedirs(_DB_DIR, exist_ok=True)
+
+
+_OrjsonProvider: Optional[type] = None
+if _USING_FLASK and orjson is not None:  # pragma: no cover - requires Flask
+    try:
+        from flask.json.provider import DefaultJSONProvider  # type: ignore
+    except ImportError:  # Flask < 2.2 has no pluggable JSON provider
+        DefaultJSONProvider = None  # type: ignore[assignment,misc]
+
+    if DefaultJSONProvider is not None:
+
+        _COMPACT_SEPARATORS = (",", ":")
+        # orjson writes exponent floats as 1e20 / 1e-7 where the stdlib writes
+        # 1e+20 / 1e-07; a digit followed by an exponent marks such output.
+        _EXPONENT_RE = re.compile(r"\de[-\d]")
+        # orjson decodes integers outside the 64-bit range as floats.
+        _WIDE_INT_RE = re.compile(r"\d{19,}")
+        _WIDE_INT_BYTES_RE = re.compile(rb"\d{19,}")
+
+        class _OrjsonJSONProvider(DefaultJSONProvider):
+            """Flask JSON provider that encodes and decodes with orjson.
+
+            Only compact output (what ``jsonify`` asks for outside debug mode)
+            goes through orjson, honouring ``sort_keys`` and ``default``. Any
+            other formatting request, non-ASCII output while ``ensure_ascii``
+            is set, and exponent floats are delegated to the stdlib encoder,
+            and input with integers wider than 64 bits to the stdlib decoder.
+            One difference remains: NaN and infinities are encoded as
+            ``null`` rather than the stdlib's non-standard ``NaN``/``Infinity``.
+            """
+
+            def dumps(self, obj: Any, **kwargs: Any) -> str:
+                if kwargs != {"separators": _COMPACT_SEPARATORS}:
+                    return super().dumps(obj, **kwargs)
+                option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                if self.sort_keys:
+                    option |= orjson.OPT_SORT_KEYS
+                try:
+                    out = orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+                except TypeError:
+                    return super().dumps(obj, **kwargs)
+                if (self.ensure_ascii and not out.isascii()) or _EXPONENT_RE.search(out):
+                    return super().dumps(obj, **kwargs)
+                return out
+
+            def loads(self, s: Any, **kwargs: Any) -> Any:
+                pattern = _WIDE_INT_RE if isinstance(s, str) else _WIDE_INT_BYTES_RE
+                if kwargs or pattern.search(s):
+                    return super().loads(s, **kwargs)
+                return orjson.loads(s)
+
+        _OrjsonProvider = _OrjsonJSONProvider
 
 
 class DataManager:
@@ -182,15 +285,50 @@ class DataManager:
         self.started = False
 
 
+def _index_static_files(static_folder: str) -> Set[str]:
+    """Return the '/'-separated paths of all files under ``static_folder``."""
+
+    files: Set[str] = set()
+    prefix_len = len(os.path.join(static_folder, ''))
+    for root, _dirs, names in os.walk(static_folder):
+        rel_root = root[prefix_len:].replace(os.sep, '/')
+        for name in names:
+            files.add(f"{rel_root}/{name}" if rel_root else name)
+    return files
+
+
+_HEALTHZ_BODY = b'{"ok":true}'
+_HEALTHZ_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(_HEALTHZ_BODY))),
+]
+
+
+def _healthz_shortcut(wsgi_app: Callable[..., Iterable[bytes]]) -> Callable[..., Iterable[bytes]]:
+    """Wrap ``wsgi_app`` so GET/HEAD ``/healthz`` skips Flask's dispatch.
+
+    Probe traffic then never builds a request context, opens a session or
+    runs teardown hooks; every other request goes to ``wsgi_app`` unchanged.
+    """
+
+    def app(environ: Dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        if environ.get('PATH_INFO') == '/healthz':
+            method = environ.get('REQUEST_METHOD')
+            if method == 'GET' or method == 'HEAD':
+                start_response('200 OK', list(_HEALTHZ_HEADERS))
+                return [b''] if method == 'HEAD' else [_HEALTHZ_BODY]
+        return wsgi_app(environ, start_response)
+
+    return app
+
+
 def create_app():
     """Application factory for the Telegram alert service."""
-    base_dir = os.path.abspath(os.path.dirname(__file__))
-    app = Flask(__name__, static_folder=os.path.join(base_dir, 'static'))
+    app = Flask(__name__, static_folder=_STATIC_DIR)
+    if _OrjsonProvider is not None:
+        app.json = _OrjsonProvider(app)
 
-    # Database directory
-    db_dir = os.path.join(base_dir, 'database')
-    os.makedirs(db_dir, exist_ok=True)
-    app.config['DB_DIR'] = db_dir
+    app.config['DB_DIR'] = _DB_DIR
 
     data_manager = DataManager()
     data_manager.start()
@@ -204,18 +342,48 @@ def create_app():
     def health():
         return jsonify({"ok": True})
 
+    # Static folder -> relative paths of the files in it, walked once so a
+    # request needs no syscalls to tell an asset from an SPA deep link. Paths
+    # whose file has since been deleted are dropped when sending fails. Other
+    # files added after startup are not seen until the index is rebuilt by
+    # clearing app.config['STATIC_FILES']; the exception is index.html, which
+    # is re-checked on disk while it is missing.
+    static_files: Dict[str, Set[str]] = {}
+    if app.static_folder and os.path.isdir(app.static_folder):
+        static_files[app.static_folder] = _index_static_files(app.static_folder)
+    app.config['STATIC_FILES'] = static_files
+
+    def send_static(static_folder, files, path):
+        try:
+            resp = send_from_directory(static_folder, path, max_age=STATIC_MAX_AGE)
+        except NotFound:
+            resp = None
+        if resp is None or resp.status_code == 404:
+            files.discard(path)
+            return None
+        return resp
+
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve(path):
         static_folder = app.static_folder
-        if not static_folder or not os.path.isdir(static_folder):
+        if not static_folder:
             return "Static folder not configured", 404
-        requested = os.path.join(static_folder, path)
-        if path and os.path.exists(requested):
-            return send_from_directory(static_folder, path)
-        index_path = os.path.join(static_folder, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder, 'index.html')
+        files = static_files.get(static_folder)
+        if files is None:
+            if not os.path.isdir(static_folder):
+                return "Static folder not configured", 404
+            files = static_files[static_folder] = _index_static_files(static_folder)
+        if path and path in files:
+            resp = send_static(static_folder, files, path)
+            if resp is not None:
+                return resp
+        if 'index.html' not in files and os.path.isfile(os.path.join(static_folder, 'index.html')):
+            files.add('index.html')
+        if 'index.html' in files:
+            resp = send_static(static_folder, files, 'index.html')
+            if resp is not None:
+                return resp
         return "index.html not found", 404
 
     @app.teardown_appcontext
@@ -223,6 +391,10 @@ def create_app():
         if data_manager.started:
             data_manager.stop()
 
+    # MiniFlask has no WSGI layer, so it keeps using the /healthz route above.
+    if hasattr(app, 'wsgi_app'):
+        app.wsgi_app = _healthz_shortcut(app.wsgi_app)
+
     return app
 
 
@@ -1,5 +1,6 @@
 """Plot recent earthquakes in Japan using Cartopy."""
 import matplotlib.pyplot as plt
+import numpy as np
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 
@@ -12,43 +13,75 @@ quake_data = [
     {"region": "Izu Islands (SE Honshu)", "magnitude": 4.5, "lat": 33.1, "lon": 139.5, "depth": 40, "intensity": 2},
 ]
 
+# Column-wise (SoA) copy of quake_data for plotting; region names are kept in
+# a parallel list since they are not numeric.
+quake_arr = np.array(
+    [(q["lat"], q["lon"], q["magnitude"], q["depth"], q["intensity"]) for q in quake_data],
+    dtype=[("lat", "f4"), ("lon", "f4"), ("mag", "f4"), ("depth", "i2"), ("intensity", "i2")],
+)
+quake_regions = [q["region"] for q in quake_data]
+
+# Base map (features and gridlines) built once and reused across calls; only
+# the quake artists are replaced each time.
+_BASE_FIG = None
+_BASE_AX = None
+_added_artists = []
+
+
+def _base_axes():
+    """Return the cached ``(fig, ax)`` base map, rebuilding it if it was closed."""
+    global _BASE_FIG, _BASE_AX
+    if _BASE_FIG is None or not plt.fignum_exists(_BASE_FIG.number):
+        _BASE_FIG = plt.figure(figsize=(10, 12))
+        _BASE_AX = plt.axes(projection=ccrs.PlateCarree())
+        _BASE_AX.set_extent([127, 146, 24, 46], crs=ccrs.PlateCarree())
+
+        # Add features
+        _BASE_AX.add_feature(cfeature.LAND, facecolor='lightgray')
+        _BASE_AX.add_feature(cfeature.COASTLINE)
+        _BASE_AX.add_feature(cfeature.BORDERS, linestyle=':')
+        _BASE_AX.add_feature(cfeature.OCEAN, facecolor='lightblue')
+        _BASE_AX.gridlines(draw_labels=True)
+        _BASE_AX.set_title(
+            "Recent Earthquakes in Japan (last 24h)\n"
+            "Bubble size = Magnitude, Labels = Region",
+            fontsize=14,
+        )
+        _added_artists.clear()
+    return _BASE_FIG, _BASE_AX
+
+
 def plot_quakes():
     """Create a bubble map of recent earthquakes in Japan."""
-    fig = plt.figure(figsize=(10, 12))
-    ax = plt.axes(projection=ccrs.PlateCarree())
-    ax.set_extent([127, 146, 24, 46], crs=ccrs.PlateCarree())
-
-    # Add features
-    ax.add_feature(cfeature.LAND, facecolor='lightgray')
-    ax.add_feature(cfeature.COASTLINE)
-    ax.add_feature(cfeature.BORDERS, linestyle=':')
-    ax.add_feature(cfeature.OCEAN, facecolor='lightblue')
-    ax.gridlines(draw_labels=True)
-
-    # Plot quakes
-    for quake in quake_data:
-        ax.scatter(
-            quake["lon"],
-            quake["lat"],
-            s=quake["magnitude"] * 60,
-            color='red',
-            alpha=0.6,
-            edgecolor='black',
-            transform=ccrs.PlateCarree(),
-        )
-        ax.text(
-            quake["lon"] + 0.2,
-            quake["lat"] + 0.2,
-            f"M{quake['magnitude']} ({quake['region']})",
+    fig, ax = _base_axes()
+
+    # Drop the quakes drawn by the previous call
+    for artist in _added_artists:
+        artist.remove()
+    _added_artists.clear()
+
+    # Plot quakes: one scatter (and one projection transform) for the batch
+    _added_artists.append(ax.scatter(
+        quake_arr["lon"],
+        quake_arr["lat"],
+        s=quake_arr["mag"] * 60,
+        color='red',
+        alpha=0.6,
+        edgecolor='black',
+        transform=ccrs.PlateCarree(),
+    ))
+    label_lons = quake_arr["lon"] + 0.2
+    label_lats = quake_arr["lat"] + 0.2
+    for lon, lat, mag, region in zip(label_lons, label_lats, quake_arr["mag"], quake_regions):
+        _added_artists.append(ax.text(
+            lon,
+            lat,
+            f"M{mag:.1f} ({region})",
             fontsize=8,
             transform=ccrs.PlateCarree(),
-        )
+        ))
 
-    plt.title(
-        "Recent Earthquakes in Japan (last 24h)\n"
-        "Bubble size = Magnitude, Labels = Region",
-        fontsize=14,
-    )
+    plt.figure(fig.number)
     plt.show()
 
 if __name__ == "__main__":
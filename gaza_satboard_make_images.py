@@ -8,6 +8,7 @@ Run on your machine or in Colab. Produces:
 
 Dependencies (pip):
 pip install pystac-client rasterio rioxarray matplotlib numpy pillow python-pptx affine requests tqdm pystac
+optional: pip install numba  or  pip install numexpr   (faster NDVI)
 
 Notes:
 - Uses the public STAC endpoint: https://earth-search.aws.element84.com/v0
@@ -16,8 +17,13 @@ Notes:
 """
 
 import os, sys, math, requests
+import functools, hashlib, json
+from concurrent.futures import ThreadPoolExecutor
+import pystac
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import Affine
 import rioxarray as rxr
 import matplotlib.pyplot as plt
 from matplotlib_scalebar.scalebar import ScaleBar  # optional (pip install matplotlib-scalebar)
@@ -28,6 +34,14 @@ from pyproj import Transformer
 from pptx import Presentation
 from pptx.util import Inches
 from tqdm import tqdm
+try:
+    import numexpr as ne  # optional (pip install numexpr): fused NDVI kernel
+except ImportError:
+    ne = None
+try:
+    from numba import njit, prange  # optional (pip install numba): parallel NDVI kernel
+except ImportError:
+    njit = None
 
 # ------- USER PARAMETERS -------
 BBOX = [34.21870, 31.22005, 34.56780, 31.59454]  # [minLon,minLat,maxLon,maxLat]
@@ -36,6 +50,8 @@ PRE_END   = "2025-07-31"
 POST_START= "2025-08-15"
 POST_END  = "2025-08-25"
 OUTDIR = "gaza_sat_outputs"
+# Largest (rows, cols) worth reading: plot_and_save draws a 16x9 in figure at 200 dpi
+MAX_READ_SHAPE = (1800, 3200)
 os.makedirs(OUTDIR, exist_ok=True)
 
 # Neighbourhood centers (lon, lat)
@@ -47,14 +63,39 @@ NEIGH = {
 
 # STAC client (AWS Earth Search)
 STAC_URL = "https://earth-search.aws.element84.com/v0"
-client = Client.open(STAC_URL)
+# Chosen items are cached here so reruns skip the STAC queries entirely
+STAC_CACHE_DIR = os.path.join(OUTDIR, ".stac_cache")
+
+@functools.lru_cache(maxsize=1)
+def stac_client():
+    # opened on first use so fully cached runs never contact the endpoint
+    return Client.open(STAC_URL)
 
 # ------- helper functions -------
 def find_sentinel_item(bbox, start, end, cloud_max=20, limit=5):
     """
     Find Sentinel-2 L2A items overlapping bbox in date window; returns the first low-cloud item.
+    Results are cached on disk under STAC_CACHE_DIR, keyed on the search parameters.
+    """
+    key = json.dumps([STAC_URL, list(bbox), start, end, cloud_max, limit])
+    cache_file = os.path.join(STAC_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+    if os.path.exists(cache_file):
+        with open(cache_file, "r", encoding="utf-8") as f:
+            chosen = pystac.Item.from_dict(json.load(f))
+        print("Chosen item (cached):", chosen.id, "date:", chosen.properties.get("datetime"), "cloud:", chosen.properties.get("eo:cloud_cover"))
+        return chosen
+
+    chosen = search_sentinel_item(bbox, start, end, cloud_max=cloud_max, limit=limit)
+    os.makedirs(STAC_CACHE_DIR, exist_ok=True)
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(chosen.to_dict(), f)
+    return chosen
+
+def search_sentinel_item(bbox, start, end, cloud_max=20, limit=5):
+    """
+    Query the STAC endpoint for the least-cloudy Sentinel-2 L2A item (uncached).
     """
-    search = client.search(
+    search = stac_client().search(
         collections=["sentinel-s2-l2a-cogs"],
         bbox=bbox,
         datetime=f"{start}/{end}",
@@ -103,38 +144,68 @@ def read_rgb_and_ndvi(item, bbox):
         # form window
         window = src.window(minx, maxy, maxx, miny)  # careful with coords order
         window = window.round_offsets().round_shape()
-        # read arrays
-        red = src.read(1, window=window, out_shape=(int(window.height), int(window.width)))
         meta = src.meta.copy()
-        transform_win = src.window_transform(window)
+        # downsample to what the figure can show; COG overviews then serve
+        # the read, so far fewer bytes come over HTTP than at native 10 m.
+        scale = max(window.height / MAX_READ_SHAPE[0], window.width / MAX_READ_SHAPE[1], 1.0)
+        out_shape = (max(1, round(window.height / scale)), max(1, round(window.width / scale)))
+        transform_win = src.window_transform(window) * Affine.scale(
+            window.width / out_shape[1], window.height / out_shape[0]
+        )
         crs = src.crs
 
-    # read green, blue, nir similarly using rasterio.open and same window/transform approach:
-    def read_band(href, transform_win=None, window=None):
+    # read all four bands with the B04 window (they share the MGRS tile grid).
+    # Each read is a series of HTTP range requests and rasterio releases the
+    # GIL while it waits, so issuing them from threads overlaps the round trips.
+    def read_band(href, window):
         with rasterio.open(href) as s:
-            arr = s.read(1, window=window, out_shape=(int(window.height), int(window.width)))
+            arr = s.read(1, window=window, out_shape=out_shape, resampling=Resampling.average)
             return arr
-    green = read_band(b3, window=window)
-    blue  = read_band(b2, window=window)
-    nir   = read_band(b8, window=window)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        red, green, blue, nir = executor.map(read_band, [b4, b3, b2, b8], [window] * 4)
 
-    # convert to float and scale (Sentinel L2A typically scaled 0-10000)
+    # convert to float and scale (Sentinel L2A typically scaled 0-10000);
+    # one multiply converts uint16 -> float32 and scales in a single allocation
     def scale_arr(a):
-        arr = a.astype('float32')
-        # if values > 10000 assume scaled 0..10000
-        if arr.max() > 10000:
-            pass
-        return arr / 10000.0
+        return np.multiply(a, np.float32(1.0 / 10000.0), dtype=np.float32)
 
     r = scale_arr(red); g = scale_arr(green); b = scale_arr(blue); n = scale_arr(nir)
     # stack RGB
     rgb = np.dstack([r,g,b])
-    # compute ndvi
-    ndvi = (n - r) / (n + r + 1e-6)
-    # clip to -1..1
-    ndvi = np.clip(ndvi, -1, 1)
+    ndvi = compute_ndvi(n, r)
     return rgb, ndvi, transform_win, crs
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def ndvi_kernel(n, r, out):
+        # one parallel pass over flat float32 arrays: NDVI + clip to -1..1
+        for i in prange(n.size):
+            v = (n[i] - r[i]) / (n[i] + r[i] + np.float32(1e-6))
+            out[i] = -1.0 if v < -1.0 else (1.0 if v > 1.0 else v)
+
+def compute_ndvi(n, r):
+    """
+    NDVI clipped to -1..1, computed in a single fused pass where possible:
+    numba kernel if available, else numexpr, else in-place numpy ops.
+    """
+    if njit is not None:
+        n = np.ascontiguousarray(n, dtype=np.float32)
+        r = np.ascontiguousarray(r, dtype=np.float32)
+        ndvi = np.empty_like(n)
+        ndvi_kernel(n.ravel(), r.ravel(), ndvi.ravel())
+        return ndvi
+    eps = np.float32(1e-6)
+    if ne is not None:
+        ndvi = ne.evaluate("(n - r) / (n + r + eps)")
+    else:
+        ndvi = n - r
+        denom = n + r
+        denom += eps
+        ndvi /= denom
+    # clip to -1..1 in place
+    np.clip(ndvi, -1, 1, out=ndvi)
+    return ndvi
+
 def plot_and_save(rgb, ndvi, transform, crs, out_prefix, item, bbox, annotations):
     """
     Create:
@@ -176,6 +247,14 @@ def plot_and_save(rgb, ndvi, transform, crs, out_prefix, item, bbox, annotations
     print("Saved:", os.path.join(OUTDIR, f"{out_prefix}_combined.png"))
 
 # ------- Main flow -------
+def add_image_slide(prs, layout, filename):
+    """Append a slide to ``prs`` holding the image ``OUTDIR/filename``."""
+    slide = prs.slides.add_slide(layout)
+    left = Inches(0.3)
+    top = Inches(0.6)
+    slide.shapes.add_picture(os.path.join(OUTDIR, filename), left, top, width=Inches(9.0))
+    return slide
+
 def main():
     print("Searching STAC for PRE window...")
     pre_item = find_sentinel_item(BBOX, PRE_START, PRE_END)
@@ -189,24 +268,26 @@ def main():
     annotations = [{"name":k, "lon":v[0], "lat":v[1]} for k,v in NEIGH.items()]
     plot_and_save(pre_rgb, pre_ndvi, pre_transform, pre_crs, "pre", pre_item, BBOX, annotations)
 
-    # read & process POST
-    print("Reading POST item and computing NDVI (may stream COGs)...")
-    post_rgb, post_ndvi, post_transform, post_crs = read_rgb_and_ndvi(post_item, BBOX)
-    print("Writing POST annotated images...")
-    plot_and_save(post_rgb, post_ndvi, post_transform, post_crs, "post", post_item, BBOX, annotations)
-
     # Make a simple PPTX with the results
     prs = Presentation()
     title_slide_layout = prs.slide_layouts[5]  # blank
     # Title slide
     slide = prs.slides.add_slide(prs.slide_layouts[0])
     slide.shapes.title.text = "Gaza SatBoard — Sentinel-2 annotated imagery"
-    # Add pre/post combined
-    for f in ["pre_combined.png", "post_combined.png"]:
-        slide = prs.slides.add_slide(title_slide_layout)
-        left = Inches(0.3)
-        top = Inches(0.6)
-        slide.shapes.add_picture(os.path.join(OUTDIR, f), left, top, width=Inches(9.0))
+
+    # Embed the PRE slide in the background while the POST COGs stream in;
+    # the future is joined before the POST slide is added, so slide order holds.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pre_slide = executor.submit(add_image_slide, prs, title_slide_layout, "pre_combined.png")
+
+        # read & process POST
+        print("Reading POST item and computing NDVI (may stream COGs)...")
+        post_rgb, post_ndvi, post_transform, post_crs = read_rgb_and_ndvi(post_item, BBOX)
+        print("Writing POST annotated images...")
+        plot_and_save(post_rgb, post_ndvi, post_transform, post_crs, "post", post_item, BBOX, annotations)
+
+        pre_slide.result()
+    add_image_slide(prs, title_slide_layout, "post_combined.png")
     outppt = os.path.join(OUTDIR, "gaza_satboard_images.pptx")
     prs.save(outppt)
     print("Saved PPTX:", outppt)
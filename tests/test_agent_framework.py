@@ -0,0 +1,503 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import agent_framework as af
+
+
+class CountingLLMClient:
+    model = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, system, user):
+        self.calls += 1
+        return f"response {self.calls}"
+
+
+def test_caching_client_reuses_exact_matches():
+    inner = CountingLLMClient()
+    client = af.CachingLLMClient(inner)
+
+    assert client.chat(system="sys", user="hello") == "response 1"
+    assert client.chat(system="sys", user="hello") == "response 1"
+    assert client.chat(system="sys", user="other") == "response 2"
+    assert inner.calls == 2
+    assert client.stats() == {"hits": 1, "misses": 2}
+
+
+def test_caching_client_bypass_and_eviction():
+    inner = CountingLLMClient()
+    client = af.CachingLLMClient(inner, maxsize=1)
+
+    client.chat(system="sys", user="a")
+    assert client.chat(system="sys", user="a", bypass=True) == "response 2"
+    client.chat(system="sys", user="b")
+    client.chat(system="sys", user="a")
+    assert inner.calls == 4
+
+
+def test_caching_client_persists_to_disk(tmp_path):
+    first = af.CachingLLMClient(CountingLLMClient(), cache_dir=str(tmp_path))
+    first.chat(system="sys", user="hello")
+    first.close()
+
+    inner = CountingLLMClient()
+    second = af.CachingLLMClient(inner, cache_dir=str(tmp_path))
+    assert second.chat(system="sys", user="hello") == "response 1"
+    assert inner.calls == 0
+    second.close()
+
+
+def test_handle_task_logs_cache_stats():
+    orch = af.build_default_system()
+    task = orch.handle_task(af.Task(user_id="u", objective="Summarize the repo"))
+
+    assert task.status == af.TaskStatus.COMPLETED
+    assert any("LLM cache:" in log for log in task.logs)
+
+
+def _bag_of_letters(text):
+    import numpy as np
+
+    vec = np.zeros(26, dtype=np.float32)
+    for ch in text.lower():
+        if "a" <= ch <= "z":
+            vec[ord(ch) - ord("a")] += 1
+    return vec
+
+
+def test_semantic_cache_matches_paraphrases(tmp_path):
+    pytest.importorskip("numpy")
+    inner = CountingLLMClient()
+    cache = af.SemanticLLMCache(inner, embed_fn=_bag_of_letters, threshold=0.95, cache_dir=str(tmp_path))
+
+    assert cache.chat(system="sys", user="plan the audit") == "response 1"
+    assert cache.chat(system="sys", user="Plan the audit!") == "response 1"
+    assert cache.chat(system="other", user="plan the audit") == "response 2"
+    assert cache.chat(system="sys", user="xyz") == "response 3"
+    assert cache.stats() == {"hits": 1, "misses": 3}
+    cache.close()
+
+    reloaded = af.SemanticLLMCache(CountingLLMClient(), embed_fn=_bag_of_letters, cache_dir=str(tmp_path))
+    assert reloaded.chat(system="sys", user="plan the audit") == "response 1"
+
+
+def test_semantic_cache_overwrites_oldest_entry():
+    pytest.importorskip("numpy")
+    inner = CountingLLMClient()
+    cache = af.SemanticLLMCache(inner, embed_fn=_bag_of_letters, threshold=0.99, max_entries=2)
+
+    cache.chat(system="sys", user="aaa")
+    cache.chat(system="sys", user="bbb")
+    cache.chat(system="sys", user="ccc")
+    assert cache.chat(system="sys", user="bbb") == "response 2"
+    assert cache.chat(system="sys", user="aaa") == "response 4"
+
+
+def test_plan_waves_group_independent_steps():
+    orch = af.build_default_system()
+    plan = [
+        af.Step(description="look up", agent_name="research"),
+        af.Step(description="check code", agent_name="code"),
+        af.Step(description="explain", agent_name="comms"),
+        af.Step(description="follow up", agent_name="research"),
+    ]
+
+    waves = orch._plan_waves(plan)
+    assert [[s.description for s in wave] for wave in waves] == [
+        ["look up", "check code"],
+        ["explain"],
+        ["follow up"],
+    ]
+
+
+def test_independent_steps_run_concurrently():
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class BarrierAgent(af.BaseAgent):
+        def run(self, step, task):
+            barrier.wait()
+            return step.description
+
+    orch = af.build_default_system()
+    agent = BarrierAgent("barrier", orch.llm, af.ToolRegistry(), orch.memory)
+    orch.agents["barrier"] = agent
+    task = af.Task(user_id="u", objective="parallel")
+    task.plan = [
+        af.Step(description="one", agent_name="barrier"),
+        af.Step(description="two", agent_name="barrier"),
+    ]
+
+    results = orch._run_wave([(step, agent) for step in task.plan], task)
+    assert [result for result, error, _ in results] == ["one", "two"]
+
+
+def test_vector_store_ranks_by_similarity():
+    pytest.importorskip("numpy")
+    store = af.SimpleVectorStore(embed_fn=_bag_of_letters)
+    for text in ["zebra zoo", "apple pie", "banana bread", "apple tart"]:
+        store.add("u", text)
+
+    results = store.search("u", "apple", top_k=2)
+    assert [item["text"] for item in results] == ["apple pie", "apple tart"]
+    assert len(store.search("u", "apple", top_k=10)) == 4
+
+
+def test_vector_store_skips_items_the_embedder_rejects():
+    pytest.importorskip("numpy")
+
+    def embed(text):
+        if text == "broken":
+            raise RuntimeError("model failed to load")
+        return _bag_of_letters(text)
+
+    store = af.SimpleVectorStore(embed_fn=embed)
+    store.add("u", "apple pie")
+    with pytest.raises(RuntimeError):
+        store.add("u", "broken")
+    with pytest.raises(RuntimeError):
+        store.add("other", "broken")
+
+    assert [item["text"] for item in store.search("u", "apple", top_k=5)] == ["apple pie"]
+    assert "other" not in store.data
+
+
+def test_vector_store_without_embedder_returns_recent_items():
+    store = af.SimpleVectorStore()
+    for text in ["one", "two", "three"]:
+        store.add("u", text)
+
+    assert [item["text"] for item in store.search("u", "anything", top_k=2)] == ["two", "three"]
+
+
+def test_vector_store_switches_to_hnsw_index():
+    pytest.importorskip("numpy")
+    pytest.importorskip("faiss")
+    store = af.SimpleVectorStore(embed_fn=_bag_of_letters, hnsw_threshold=3)
+    for text in ["zebra zoo", "apple pie", "banana bread", "apple tart"]:
+        store.add("u", text)
+
+    assert store.data["u"].index is not None
+    assert store.search("u", "apple", top_k=1)[0]["text"] == "apple pie"
+
+
+def test_parse_json_strips_fences():
+    fenced = '```json\n{"steps": [{"description": "a ``` b", "agent_name": "research"}]}\n```\n'
+
+    assert af.strip_json_fences('{"a": 1}') == '{"a": 1}'
+    assert af.parse_json(fenced) == {"steps": [{"description": "a ``` b", "agent_name": "research"}]}
+    assert af.parse_json('  ```\n[1, 2]\n  ```') == [1, 2]
+
+
+def test_fit_budget_truncates_and_drops_oldest():
+    steps = [af.Step(description=f"step {i}", agent_name="research", result="x" * 1000) for i in range(3)]
+
+    per_step = af.count_tokens("step 0") + af.count_tokens("x" * 800 + "…")
+    fitted = af._fit_budget(steps, max_tokens=2 * per_step + 1, max_per_result=800)
+    assert [entry["description"] for entry in fitted] == ["step 1", "step 2"]
+    assert all(len(entry["result"]) == 801 for entry in fitted)
+
+
+def test_fit_budget_condenses_long_results_once():
+    inner = CountingLLMClient()
+    step = af.Step(description="long", agent_name="research", result="y" * (af.PRIOR_RESULT_SUMMARY_CHARS + 1))
+
+    assert af._fit_budget([step], inner)[0]["result"] == "response 1"
+    assert af._fit_budget([step], inner)[0]["result"] == "response 1"
+    assert inner.calls == 1
+
+
+def test_numba_topk_matches_numpy():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("numba")
+    import vector_ops
+
+    rng = np.random.default_rng(0)
+    mat = rng.standard_normal((500, 16)).astype(np.float32)
+    mat /= np.linalg.norm(mat, axis=1, keepdims=True)
+    q = mat[42]
+
+    ids, scores = vector_ops.topk_cosine(mat, q, 5)
+    expected = np.argsort(-(mat @ q))[:5]
+    assert list(ids) == list(expected)
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_now_iso_format():
+    from datetime import datetime, timezone
+
+    stamp = af.now_iso()
+    parsed = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
+
+
+def test_agents_bind_tools_and_fall_back_to_registry():
+    tools = af.ToolRegistry()
+    memory = af.MemoryLayer(af.SimpleVectorStore(), af.SimpleKVStore())
+    agent = af.ResearchAgent("research", af.DummyLLMClient(), tools, memory)
+
+    tools.register("web_search", lambda query, max_results: [{"title": query}])
+    assert agent._web_search(query="late", max_results=1) == [{"title": "late"}]
+    assert tools.get_tool("web_search") is tools.tools["web_search"]
+    with pytest.raises(ValueError):
+        tools.get_tool("missing")
+
+
+def test_system_prompts_are_frozen():
+    assert af._system_prompt_digest() == af._SYSTEM_PROMPT_HASH
+
+
+def test_registry_runs_async_tools_on_shared_loop():
+    import asyncio
+
+    loops = []
+
+    async def fetch(value):
+        loops.append(asyncio.get_running_loop())
+        await asyncio.sleep(0)
+        return value * 2
+
+    tools = af.ToolRegistry()
+    tools.register("fetch", fetch)
+    tools.register("web_search", af.web_search_tool)
+
+    assert tools.call("fetch", value=2) == 4
+    assert tools.call("fetch", value=3) == 6
+    assert loops[0] is loops[1]
+    assert len(tools.call("web_search", query="q", max_results=2)) == 2
+
+
+class PlanningLLMClient(CountingLLMClient):
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+
+    def chat(self, system, user):
+        if system == af._PLANNER_SYSTEM:
+            return af.json_compact({"steps": self.steps})
+        return super().chat(system, user)
+
+
+def test_duplicate_steps_reuse_first_result():
+    searches = []
+    step = {"description": "look it up", "agent_name": "research"}
+    orch = af.build_default_system(PlanningLLMClient([step, step, {"description": "explain", "agent_name": "comms"}]))
+    orch.agents["research"]._web_search = lambda **kwargs: searches.append(kwargs) or []
+
+    task = orch.handle_task(af.Task(user_id="u", objective="dedup"))
+
+    assert len(searches) == 1
+    assert task.plan[0].result == task.plan[1].result
+    assert task.plan[1].status == af.StepStatus.DONE
+    assert any("Dedup hit" in log for log in task.logs)
+
+
+def test_json_helpers_round_trip():
+    payload = {"name": "Zoë", "count": 2, "big": 2**70 + 1, "neg": -(10**19) - 1, "items": [1, 2]}
+
+    assert af.json_loads(af.json_compact(payload)) == payload
+    assert af.json_loads(af.json_dump(payload)) == payload
+    assert af.json_compact({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert af.json_dump({"a": 1}) == '{\n  "a": 1\n}'
+
+
+def test_checkpoints_resume_interrupted_task(tmp_path):
+    path = str(tmp_path / "ckpt.db")
+    steps = [
+        {"description": "look it up", "agent_name": "research"},
+        {"description": "write code", "agent_name": "code"},
+    ]
+    orch = af.build_default_system(PlanningLLMClient(steps), checkpoint_path=path)
+    orch.max_workers = 1
+
+    def crash(**kwargs):
+        raise RuntimeError("boom")
+
+    orch.agents["code"]._run_code = crash
+    first = orch.handle_task(af.Task(user_id="u", objective="resume me"))
+    assert first.plan[1].status == af.StepStatus.ERROR
+
+    searches = []
+    orch = af.build_default_system(PlanningLLMClient(steps), checkpoint_path=path)
+    orch.agents["research"]._web_search = lambda **kwargs: searches.append(kwargs) or []
+    second = orch.handle_task(af.Task(user_id="u", objective="resume me"))
+
+    assert searches == []
+    assert second.plan[0].result == first.plan[0].result
+    assert second.plan[1].status == af.StepStatus.DONE
+    assert orch.checkpoints.load(af.CheckpointStore.task_key(second), 0, "look it up") is None
+
+
+def test_semantic_cache_requires_an_embedder(monkeypatch):
+    monkeypatch.setattr(af, "_default_embed_fn", lambda: None)
+
+    with pytest.raises(RuntimeError):
+        af.build_default_system(semantic_cache_threshold=0.9)
+
+
+def test_orchestrator_close_persists_semantic_cache(tmp_path):
+    pytest.importorskip("numpy")
+    semantic = af.SemanticLLMCache(CountingLLMClient(), embed_fn=_bag_of_letters, cache_dir=str(tmp_path))
+    orch = af.build_default_system(semantic, checkpoint_path=str(tmp_path / "ckpt.db"))
+    orch.llm.chat(system="sys", user="plan the audit")
+    orch.close()
+
+    inner = CountingLLMClient()
+    reloaded = af.SemanticLLMCache(inner, embed_fn=_bag_of_letters, cache_dir=str(tmp_path))
+    assert reloaded.chat(system="sys", user="plan the audit") == "response 1"
+    assert inner.calls == 0
+
+
+class FakeBatchSDK:
+    """Stand-in for the OpenAI SDK ``files``/``batches`` endpoints.
+
+    Batches stay ``in_progress`` until ``gate`` is set.
+    """
+
+    def __init__(self, respond, gate=None):
+        self.respond = respond
+        self.gate = gate
+        self.uploads = []
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create, retrieve=self._retrieve)
+
+    def _upload(self, file, purpose):
+        self.uploads.append([af.json_loads(line) for line in file[1].decode("utf-8").splitlines()])
+        return SimpleNamespace(id=f"file-{len(self.uploads) - 1}")
+
+    def _create(self, input_file_id, endpoint, completion_window):
+        index = input_file_id.split("-")[1]
+        return SimpleNamespace(id=f"batch-{index}", status="validating", output_file_id=None)
+
+    def _retrieve(self, batch_id):
+        index = batch_id.split("-")[1]
+        if self.gate is not None and not self.gate.is_set():
+            return SimpleNamespace(id=batch_id, status="in_progress", output_file_id=None)
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id=f"out-{index}")
+
+    def _content(self, file_id):
+        lines = self.respond(self.uploads[int(file_id.split("-")[1])])
+        return SimpleNamespace(text="\n".join(af.json_compact(line) for line in lines))
+
+
+def _echo_batch(records):
+    return [
+        {
+            "custom_id": record["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": record["body"]["messages"][1]["content"]}}]},
+            },
+        }
+        for record in records
+    ]
+
+
+def test_batching_client_routes_results_by_custom_id():
+    def respond(records):
+        ok, failed, _missing = records
+        return [
+            {"custom_id": "unknown", "response": {"status_code": 200}},
+            {"custom_id": failed["custom_id"], "response": {"status_code": 500}, "error": {"message": "boom"}},
+            {
+                "custom_id": ok["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": "answer " + ok["body"]["messages"][1]["content"]}}]},
+                },
+            },
+        ]
+
+    sdk = FakeBatchSDK(respond)
+    client = af.BatchingLLMClient(
+        realtime=CountingLLMClient(), client=sdk, flush_interval=5, max_batch=3, poll_interval=0
+    )
+    futures = [client.submit("sys", user) for user in ("a", "b", "c")]
+
+    assert futures[0].result(timeout=5) == "answer a"
+    with pytest.raises(RuntimeError, match="boom"):
+        futures[1].result(timeout=5)
+    with pytest.raises(RuntimeError, match="no result"):
+        futures[2].result(timeout=5)
+    assert len(sdk.uploads) == 1
+
+
+def test_batching_client_priority_skips_queue():
+    def respond(records):
+        raise AssertionError("priority calls must not be batched")
+
+    sdk = FakeBatchSDK(respond)
+    realtime = CountingLLMClient()
+    client = af.BatchingLLMClient(realtime=realtime, client=sdk)
+
+    assert client.chat(system="sys", user="now", priority=True) == "response 1"
+    assert realtime.calls == 1
+    assert sdk.uploads == []
+
+
+def test_batching_client_submits_while_earlier_batch_runs():
+    import threading
+    import time
+
+    gate = threading.Event()
+    sdk = FakeBatchSDK(_echo_batch, gate=gate)
+    client = af.BatchingLLMClient(
+        realtime=CountingLLMClient(), client=sdk, flush_interval=0.01, max_batch=1, poll_interval=0.01
+    )
+    first = client.submit("sys", "one")
+    second = client.submit("sys", "two")
+
+    deadline = time.monotonic() + 5
+    while len(sdk.uploads) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(sdk.uploads) == 2
+    assert not first.done()
+
+    gate.set()
+    assert first.result(timeout=5) == "one"
+    assert second.result(timeout=5) == "two"
+    client.close()
+
+
+def test_batching_client_close_fails_pending_calls():
+    import threading
+
+    sdk = FakeBatchSDK(_echo_batch, gate=threading.Event())
+    client = af.BatchingLLMClient(realtime=CountingLLMClient(), client=sdk, flush_interval=0.01, poll_interval=0.01)
+    future = client.submit("sys", "never")
+
+    client.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        future.result(timeout=5)
+    with pytest.raises(RuntimeError, match="closed"):
+        client.submit("sys", "late")
+
+
+def test_restored_steps_serve_later_duplicates(tmp_path):
+    path = str(tmp_path / "ckpt.db")
+    lookup = {"description": "look it up", "agent_name": "research"}
+    steps = [lookup, {"description": "write code", "agent_name": "code"}, lookup]
+    orch = af.build_default_system(PlanningLLMClient(steps), checkpoint_path=path)
+
+    def crash(**kwargs):
+        raise RuntimeError("boom")
+
+    orch.agents["code"]._run_code = crash
+    first = orch.handle_task(af.Task(user_id="u", objective="resume dedup"))
+    assert first.plan[1].status == af.StepStatus.ERROR
+
+    searches = []
+    orch = af.build_default_system(PlanningLLMClient(steps), checkpoint_path=path)
+    orch.agents["research"]._web_search = lambda **kwargs: searches.append(kwargs) or []
+    second = orch.handle_task(af.Task(user_id="u", objective="resume dedup"))
+
+    assert searches == []
+    assert second.plan[2].result == first.plan[0].result
+    assert any("Dedup hit" in log for log in second.logs)
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import app as app_module
 
@@ -55,3 +57,110 @@ def test_data_manager_stops_after_request_using_fallback(monkeypatch):
     resp = client.get('/healthz')
     assert resp.status_code == 200
     assert data_manager.started is False
+
+
+def test_static_files_cached_with_validators(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "Flask", app_module.MiniFlask)
+
+    flask_app = create_app()
+    flask_app.static_folder = str(tmp_path)
+    asset = tmp_path / 'app.js'
+    asset.write_text('one', encoding='utf-8')
+    client = flask_app.test_client()
+
+    resp = client.get('/app.js')
+    assert resp.get_data(as_text=True) == 'one'
+    assert resp.headers['Cache-Control'] == f'public, max-age={app_module.STATIC_MAX_AGE}'
+    etag = resp.headers['ETag']
+
+    asset.write_text('two!', encoding='utf-8')
+    resp = client.get('/app.js')
+    assert resp.get_data(as_text=True) == 'two!'
+    assert resp.headers['ETag'] != etag
+
+
+def test_static_file_index_built_at_startup(tmp_path, monkeypatch):
+    static_dir = tmp_path / 'static'
+    (static_dir / 'js').mkdir(parents=True)
+    (static_dir / 'js' / 'app.js').write_text('js', encoding='utf-8')
+    (static_dir / 'index.html').write_text('index', encoding='utf-8')
+    monkeypatch.setattr(app_module, '_STATIC_DIR', str(static_dir))
+
+    flask_app = create_app()
+    assert flask_app.config['STATIC_FILES'][str(static_dir)] == {'index.html', 'js/app.js'}
+
+    client = flask_app.test_client()
+    assert client.get('/js/app.js').get_data(as_text=True) == 'js'
+    checked = []
+    isfile = os.path.isfile
+    with monkeypatch.context() as patch:
+        patch.setattr(app_module.os.path, 'isfile', lambda p: checked.append(p) or isfile(p))
+        assert client.get('/some/route').get_data(as_text=True) == 'index'
+    assert not any('route' in p for p in checked)
+
+    (static_dir / 'js' / 'app.js').unlink()
+    assert client.get('/js/app.js').get_data(as_text=True) == 'index'
+    assert 'js/app.js' not in flask_app.config['STATIC_FILES'][str(static_dir)]
+
+    (static_dir / 'late.txt').write_text('late', encoding='utf-8')
+    assert client.get('/late.txt').get_data(as_text=True) == 'index'
+    flask_app.config['STATIC_FILES'].clear()
+    assert client.get('/late.txt').get_data(as_text=True) == 'late'
+
+
+def test_healthz_shortcut_bypasses_wrapped_app():
+    calls = []
+
+    def wrapped(environ, start_response):
+        calls.append(environ['PATH_INFO'])
+        start_response('404 NOT FOUND', [])
+        return [b'']
+
+    wsgi = app_module._healthz_shortcut(wrapped)
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append((status, dict(headers)))
+
+    body = wsgi({'PATH_INFO': '/healthz', 'REQUEST_METHOD': 'GET'}, start_response)
+    assert b''.join(body) == b'{"ok":true}'
+    assert statuses[0] == ('200 OK', {'Content-Type': 'application/json', 'Content-Length': '11'})
+    assert calls == []
+
+    wsgi({'PATH_INFO': '/other', 'REQUEST_METHOD': 'GET'}, start_response)
+    wsgi({'PATH_INFO': '/healthz', 'REQUEST_METHOD': 'POST'}, start_response)
+    assert calls == ['/other', '/healthz']
+
+
+def test_orjson_provider_matches_default_provider():
+    pytest.importorskip("flask")
+    pytest.importorskip("orjson")
+    from datetime import datetime
+    from flask.json.provider import DefaultJSONProvider
+
+    flask_app = create_app()
+    assert isinstance(flask_app.json, app_module._OrjsonProvider)
+    reference = DefaultJSONProvider(flask_app)
+    payload = {"b": 1, "a": [1.5, None, True], "when": datetime(2024, 1, 1), "name": "Zoë", "big": 2**70}
+
+    for kwargs in ({"separators": (",", ":")}, {"indent": 2}, {}):
+        assert flask_app.json.dumps(payload, **kwargs) == reference.dumps(payload, **kwargs)
+
+    for debug in (False, True):
+        flask_app.debug = debug
+        with flask_app.app_context():
+            assert flask_app.json.response(payload).get_data() == reference.response(payload).get_data()
+
+    floats = {"big": 1e20, "small": 1e-7, "plain": 0.5}
+    compact = {"separators": (",", ":")}
+    assert flask_app.json.dumps(floats, **compact) == reference.dumps(floats, **compact)
+
+    wide = '{"id": 1180591620717411303425, "neg": -10000000000000000001}'
+    assert flask_app.json.loads(wide) == reference.loads(wide) == {
+        "id": 2**70 + 1,
+        "neg": -(10**19) - 1,
+    }
+    assert flask_app.json.loads(wide.encode()) == reference.loads(wide)
+
+    # Known difference: orjson writes non-finite floats as null, not NaN.
+    assert flask_app.json.dumps({"x": float("nan")}, **compact) == '{"x":null}'
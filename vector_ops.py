@@ -0,0 +1,72 @@
+"""
+Numba kernels for the vector-search hot path in ``agent_framework``.
+
+``topk_cosine`` scores every row of a contiguous ``(N, d)`` float32 matrix
+against a query in parallel and keeps a running top-k, without the
+temporary arrays a NumPy matmul + argpartition allocates. It only pays off
+for large matrices, so callers should keep NumPy for small ones.
+
+Requires ``numba``; check ``HAVE_NUMBA`` before calling ``topk_cosine``.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _scores(mat, q):  # pragma: no cover - compiled
+        n, d = mat.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += mat[i, j] * q[j]
+            out[i] = acc
+        return out
+
+    @njit(cache=True)
+    def _select_topk(scores, k):  # pragma: no cover - compiled
+        ids = np.full(k, -1, dtype=np.int64)
+        vals = np.full(k, -np.inf, dtype=np.float32)
+        for i in range(scores.shape[0]):
+            s = scores[i]
+            if s <= vals[k - 1]:
+                continue
+            j = k - 1
+            while j > 0 and vals[j - 1] < s:
+                vals[j] = vals[j - 1]
+                ids[j] = ids[j - 1]
+                j -= 1
+            vals[j] = s
+            ids[j] = i
+        return ids, vals
+
+
+def topk_cosine(mat: np.ndarray, q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(ids, scores)`` of the ``k`` rows of ``mat`` closest to ``q``, best first.
+
+    ``mat`` rows and ``q`` must already be L2-normalised float32 vectors, so
+    the inner product is the cosine similarity.
+    """
+
+    if not HAVE_NUMBA:
+        raise RuntimeError("The 'numba' package is required for vector_ops.topk_cosine")
+
+    k = min(k, mat.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    mat = np.ascontiguousarray(mat, dtype=np.float32)
+    q = np.ascontiguousarray(q, dtype=np.float32)
+    return _select_topk(_scores(mat, q), k)